@@ -1,3 +1,21 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ContributionFlag
+
+
+@admin.register(ContributionFlag)
+class ContributionFlagAdmin(admin.ModelAdmin):
+    list_display = ('contribution', 'member', 'reason', 'score', 'status', 'created_at')
+    list_filter = ('status', 'reason')
+    list_select_related = ('contribution__member', 'member__group')
+    raw_id_fields = ('contribution', 'member')
+    ordering = ('status', '-created_at')
+    actions = ['mark_confirmed', 'mark_dismissed']
+
+    @admin.action(description='Mark selected flags as confirmed')
+    def mark_confirmed(self, request, queryset):
+        queryset.update(status='confirmed')
+
+    @admin.action(description='Mark selected flags as dismissed')
+    def mark_dismissed(self, request, queryset):
+        queryset.update(status='dismissed')
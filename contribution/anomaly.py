@@ -0,0 +1,185 @@
+import bisect
+import logging
+import math
+
+from django.db import transaction
+
+from .models import ContributionFlag, MemberContributionStats
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest contribution in the rolling mean and variance.
+ALPHA = 0.1
+# Contributions a member needs before amounts are scored.
+MIN_HISTORY = 5
+Z_THRESHOLD = 4.0
+# USSD contributions by one member in one day before the day is flagged.
+BURST_LIMIT = 5
+# Scored ids remembered per member above ``last_contribution_id``. A
+# contribution committed more than this many of the member's contributions
+# late is taken as already scored.
+RECENT_IDS = 100
+
+
+class RollingStats:
+    """Exponentially weighted mean/variance plus a per-day USSD counter."""
+
+    __slots__ = ('count', 'mean', 'variance', 'day', 'day_count', 'last_contribution_id', 'recent_ids')
+
+    def __init__(self, count=0, mean=0.0, variance=0.0, day=None, day_count=0, last_contribution_id=0, recent_ids=()):
+        self.count = count
+        self.mean = mean
+        self.variance = variance
+        self.day = day
+        self.day_count = day_count
+        self.last_contribution_id = last_contribution_id
+        self.recent_ids = sorted(recent_ids)
+
+    def seen(self, contribution_id):
+        return contribution_id <= self.last_contribution_id or contribution_id in self.recent_ids
+
+    def update(self, contribution_id, amount, day, recorded_via):
+        """Fold one contribution in and return ``(reason, score)`` pairs for it."""
+        findings = []
+        if self.count >= MIN_HISTORY and self.variance > 0:
+            z = abs(amount - self.mean) / math.sqrt(self.variance)
+            if z >= Z_THRESHOLD:
+                findings.append(('amount', z))
+
+        if self.count == 0:
+            self.mean = amount
+        else:
+            diff = amount - self.mean
+            increment = ALPHA * diff
+            self.mean += increment
+            self.variance = (1 - ALPHA) * (self.variance + diff * increment)
+        self.count += 1
+
+        if recorded_via == 'ussd':
+            if day == self.day:
+                self.day_count += 1
+            else:
+                self.day = day
+                self.day_count = 1
+            # Flag only the contribution that crosses the limit.
+            if self.day_count == BURST_LIMIT + 1:
+                findings.append(('burst', float(self.day_count)))
+
+        # Ids are remembered individually, since concurrent saves can commit
+        # (and reach the streaming path) out of id order.
+        bisect.insort(self.recent_ids, contribution_id)
+        if len(self.recent_ids) > RECENT_IDS:
+            self.last_contribution_id = self.recent_ids.pop(0)
+        return findings
+
+
+class AnomalyDetector:
+    """Scores contribution rows against per-member rolling statistics.
+
+    Rows are ``(id, member_id, amount, date, recorded_via)`` tuples in id
+    order, as read with ``values_list``. State for the members in each batch
+    is loaded with one query and written back with :meth:`save`.
+
+    With ``lock=True`` the stats rows are created if needed and read with
+    ``select_for_update`` on every batch, so concurrent detectors queue on
+    the member instead of overwriting each other's updates. Locking callers
+    must run ``process`` and ``save`` in one transaction.
+    """
+
+    fields = ('id', 'member_id', 'amount', 'date', 'recorded_via')
+
+    def __init__(self, lock=False):
+        self.lock = lock
+        self.stats = {}
+        self.dirty = set()
+        self.flags = []
+
+    def _load(self, member_ids):
+        if self.lock:
+            missing = set(member_ids)
+            known = MemberContributionStats.objects.filter(member_id__in=missing).values_list('member_id', flat=True)
+            MemberContributionStats.objects.bulk_create(
+                [MemberContributionStats(member_id=member_id) for member_id in sorted(missing.difference(known))],
+                ignore_conflicts=True,
+            )
+            # Lock in member order so two detectors cannot deadlock.
+            stored = (
+                MemberContributionStats.objects.select_for_update()
+                .filter(member_id__in=missing)
+                .order_by('member_id')
+            )
+        else:
+            missing = set(member_ids).difference(self.stats)
+            if not missing:
+                return
+            stored = MemberContributionStats.objects.filter(member_id__in=missing)
+        for row in stored:
+            self.stats[row.member_id] = RollingStats(
+                row.count, row.mean, row.variance, row.day, row.day_count, row.last_contribution_id, row.recent_ids,
+            )
+        for member_id in missing.difference(self.stats):
+            self.stats[member_id] = RollingStats()
+
+    def process(self, rows):
+        rows = list(rows)
+        self._load({row[1] for row in rows})
+        stats = self.stats
+        for contribution_id, member_id, amount, day, recorded_via in rows:
+            state = stats[member_id]
+            # Rows already folded in by the streaming path are skipped.
+            if state.seen(contribution_id):
+                continue
+            for reason, score in state.update(contribution_id, float(amount), day, recorded_via):
+                self.flags.append(ContributionFlag(
+                    contribution_id=contribution_id, member_id=member_id, reason=reason, score=score,
+                ))
+            self.dirty.add(member_id)
+        return len(rows)
+
+    def save(self):
+        rows = [
+            MemberContributionStats(
+                member_id=member_id,
+                count=state.count,
+                mean=state.mean,
+                variance=state.variance,
+                day=state.day,
+                day_count=state.day_count,
+                last_contribution_id=state.last_contribution_id,
+                recent_ids=state.recent_ids,
+            )
+            for member_id, state in ((member_id, self.stats[member_id]) for member_id in self.dirty)
+        ]
+        MemberContributionStats.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['member'],
+            update_fields=['count', 'mean', 'variance', 'day', 'day_count', 'last_contribution_id', 'recent_ids'],
+        )
+        flags = ContributionFlag.objects.bulk_create(self.flags, batch_size=1000)
+        self.dirty.clear()
+        self.flags = []
+        return flags
+
+
+def observe(contribution):
+    """Streaming entry point: score a newly saved contribution once its
+    transaction commits.
+
+    Scoring runs outside the recording transaction and its errors are only
+    logged, so the detector can neither fail nor duplicate the recording of
+    a contribution; ``detect_anomalies`` scores whatever it missed.
+    """
+    row = (contribution.pk, contribution.member_id, contribution.amount, contribution.date, contribution.recorded_via)
+    transaction.on_commit(lambda: _score(row))
+
+
+def _score(row):
+    try:
+        with transaction.atomic():
+            detector = AnomalyDetector(lock=True)
+            detector.process([row])
+            detector.save()
+    except Exception:
+        logger.exception('Scoring contribution %d failed', row[0])
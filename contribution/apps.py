@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ContributionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contribution'
+
+    def ready(self):
+        from . import signals  # noqa: F401
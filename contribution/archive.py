@@ -0,0 +1,62 @@
+from django.db import transaction
+
+from group.deletion import _delete_in_chunks
+from group.models import Group
+from .models import ArchivedContribution, Contribution, ContributionEvent
+from .snapshot import invalidate_snapshot
+
+CHUNK_SIZE = 1000
+FIELDS = ('id', 'group_id', 'member_id', 'amount', 'date', 'recorded_via')
+
+
+def archive_group(group_id, chunk_size=CHUNK_SIZE):
+    """Move contributions dated before the group's current cycle into
+    ``ArchivedContribution``, ``chunk_size`` rows per transaction.
+
+    Rows are deleted without signals. Instead each one gets an ``archived``
+    event dated on the first day of the new cycle, so ``balances_as_of``
+    still shows the closed cycle on earlier dates and agrees with the live
+    balances (which only count the current cycle) from then on.
+
+    Contributions with an open flag stay live so the flag can still be
+    reviewed; a later run moves them once it is confirmed or dismissed.
+    """
+    cycle_start = Group.objects.filter(pk=group_id).values_list('cycle_start_date', flat=True).first()
+    if cycle_start is None:
+        return 0
+    closed = (
+        Contribution.objects.filter(group_id=group_id, date__lt=cycle_start)
+        .exclude(flags__status='open')
+        .order_by('id')
+    )
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(closed.values_list(*FIELDS)[:chunk_size])
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            ArchivedContribution.objects.bulk_create(
+                [
+                    ArchivedContribution(
+                        contribution_id=pk, group_id=group, member_id=member, amount=amount,
+                        date=date, recorded_via=recorded_via, cycle_closed_on=cycle_start,
+                    )
+                    for pk, group, member, amount, date, recorded_via in rows
+                ],
+                ignore_conflicts=True,
+            )
+            ContributionEvent.objects.bulk_create([
+                ContributionEvent(
+                    group_id=group, member_id=member, contribution_id=pk,
+                    kind=ContributionEvent.ARCHIVED, amount=-amount, date=cycle_start,
+                )
+                for pk, group, member, amount, date, recorded_via in rows
+            ])
+            # Flags and anything else that cascades from the rows go first.
+            _delete_in_chunks(Contribution.objects.filter(id__in=ids), chunk_size)
+        archived += len(rows)
+    if archived:
+        invalidate_snapshot(group_id)
+    return archived
+
@@ -0,0 +1,126 @@
+from collections import defaultdict
+from datetime import date as date_type
+from decimal import Decimal
+
+from django.db.models import Max, Sum
+
+from .models import ContributionEvent, GroupBalanceSnapshot
+from .snapshot import CENTS
+
+
+def record_created(contribution):
+    return ContributionEvent.objects.create(
+        group_id=contribution.group_id,
+        member_id=contribution.member_id,
+        contribution_id=contribution.pk,
+        kind=ContributionEvent.CREATED,
+        amount=Decimal(contribution.amount),
+        date=contribution.date,
+    )
+
+
+def record_amended(contribution, previous):
+    """Log an edit given the ``previous`` field values of ``contribution``.
+
+    A change of amount alone is logged as one difference. If the member,
+    group or date moved, the old entry is reversed and the new one logged in
+    full so each event only touches one balance on one date.
+    """
+    old_amount = Decimal(previous['amount'])
+    new_amount = Decimal(contribution.amount)
+    moved = (
+        previous['group_id'] != contribution.group_id
+        or previous['member_id'] != contribution.member_id
+        or str(previous['date']) != str(contribution.date)
+    )
+    if not moved:
+        if old_amount == new_amount:
+            return []
+        return [ContributionEvent.objects.create(
+            group_id=contribution.group_id,
+            member_id=contribution.member_id,
+            contribution_id=contribution.pk,
+            kind=ContributionEvent.AMENDED,
+            amount=new_amount - old_amount,
+            date=contribution.date,
+        )]
+    return ContributionEvent.objects.bulk_create([
+        ContributionEvent(
+            group_id=previous['group_id'],
+            member_id=previous['member_id'],
+            contribution_id=contribution.pk,
+            kind=ContributionEvent.REVERSED,
+            amount=-old_amount,
+            date=previous['date'],
+        ),
+        ContributionEvent(
+            group_id=contribution.group_id,
+            member_id=contribution.member_id,
+            contribution_id=contribution.pk,
+            kind=ContributionEvent.AMENDED,
+            amount=new_amount,
+            date=contribution.date,
+        ),
+    ])
+
+
+def record_reversed(contribution):
+    return ContributionEvent.objects.create(
+        group_id=contribution.group_id,
+        member_id=contribution.member_id,
+        contribution_id=contribution.pk,
+        kind=ContributionEvent.REVERSED,
+        amount=-Decimal(contribution.amount),
+        date=contribution.date,
+    )
+
+
+def balances_as_of(group_id, as_of=None, use_snapshot=True, until_event_id=None):
+    """Return ``{member_id: balance}`` for a group on ``as_of`` (default today).
+
+    Starts from the latest snapshot on or before ``as_of`` and folds in only
+    the events it does not cover.
+    """
+    as_of = as_of or date_type.today()
+    balances = defaultdict(Decimal)
+    events = ContributionEvent.objects.filter(group_id=group_id, date__lte=as_of)
+    if until_event_id is not None:
+        events = events.filter(id__lte=until_event_id)
+
+    snapshot = None
+    if use_snapshot:
+        snapshot = (
+            GroupBalanceSnapshot.objects.filter(group_id=group_id, as_of__lte=as_of)
+            .order_by('-as_of', '-last_event_id')
+            .first()
+        )
+    if snapshot is not None:
+        for member_id, amount in snapshot.balances.items():
+            balances[int(member_id)] = Decimal(amount)
+        # Events dated after the snapshot, plus late entries backdated into it.
+        tails = [
+            events.filter(date__gt=snapshot.as_of),
+            events.filter(date__lte=snapshot.as_of, id__gt=snapshot.last_event_id),
+        ]
+    else:
+        tails = [events]
+
+    for tail in tails:
+        for row in tail.order_by().values('member_id').annotate(total=Sum('amount')):
+            balances[row['member_id']] += row['total']
+    return {member_id: amount.quantize(CENTS) for member_id, amount in balances.items()}
+
+
+def take_snapshot(group_id, as_of=None):
+    as_of = as_of or date_type.today()
+    last_event_id = ContributionEvent.objects.filter(group_id=group_id).aggregate(last=Max('id'))['last']
+    if last_event_id is None:
+        return None
+    balances = balances_as_of(group_id, as_of, until_event_id=last_event_id)
+    return GroupBalanceSnapshot.objects.create(
+        group_id=group_id,
+        as_of=as_of,
+        last_event_id=last_event_id,
+        balances={str(member_id): str(amount) for member_id, amount in balances.items()},
+        total=sum(balances.values(), Decimal('0')),
+    )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from contribution.archive import CHUNK_SIZE, archive_group
+from group.models import Group
+
+
+class Command(BaseCommand):
+    help = (
+        'Move contributions from closed cycles into the archive table in chunks. '
+        'Schedule it (e.g. nightly from cron); reruns pick up where the last one stopped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--group', type=int, action='append', dest='groups', help='Limit to these group ids.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        groups = Group.objects.order_by('id').values_list('id', flat=True)
+        if options['groups']:
+            groups = groups.filter(id__in=options['groups'])
+        total = 0
+        for group_id in groups.iterator():
+            archived = archive_group(group_id, options['chunk_size'])
+            if archived:
+                self.stdout.write(f'Group {group_id}: archived {archived} contributions.')
+            total += archived
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} contributions.'))
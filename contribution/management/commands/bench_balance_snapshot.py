@@ -0,0 +1,77 @@
+import random
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from contribution.models import Contribution
+from contribution.snapshot import GroupSnapshot
+from group.models import Group
+from member.models import Member
+
+
+class Command(BaseCommand):
+    help = 'Compare balance lookups through GroupSnapshot against the ORM path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=500)
+        parser.add_argument('--contributions', type=int, default=20, help='Contributions per member.')
+        parser.add_argument('--lookups', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        # Everything runs inside a transaction that is rolled back at the end.
+        with transaction.atomic():
+            group = self._populate(options['members'], options['contributions'])
+            phones = list(group.members.values_list('phone_number', flat=True))
+            sample = [random.choice(phones) for _ in range(options['lookups'])]
+
+            orm_bytes = self._measure_memory(lambda: list(
+                Member.objects.filter(group=group)
+                .annotate(total=Sum('contributions__amount', filter=Q(contributions__group=group)))
+            ))
+            snapshot_bytes = self._measure_memory(lambda: GroupSnapshot.build(group.pk))
+
+            start = time.perf_counter()
+            for phone in sample:
+                Contribution.objects.filter(group=group, member__phone_number=phone).aggregate(total=Sum('amount'))
+            orm_elapsed = time.perf_counter() - start
+
+            snapshot = GroupSnapshot.build(group.pk)
+            start = time.perf_counter()
+            for phone in sample:
+                snapshot.balance_for_phone(phone)
+            snapshot_elapsed = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        lookups = options['lookups']
+        self.stdout.write(f'members={options["members"]} contributions/member={options["contributions"]}')
+        self.stdout.write(f'ORM      memory={orm_bytes / 1024:.1f} KiB  lookup={orm_elapsed / lookups * 1e6:.1f} us')
+        self.stdout.write(f'snapshot memory={snapshot_bytes / 1024:.1f} KiB  lookup={snapshot_elapsed / lookups * 1e6:.1f} us')
+
+    def _populate(self, member_count, per_member):
+        group = Group.objects.create(name='Benchmark group', cycle_start_date=date.today())
+        members = Member.objects.bulk_create(
+            Member(group=group, name=f'Member {i}', phone_number=f'+2609{i:08d}')
+            for i in range(member_count)
+        )
+        Contribution.objects.bulk_create(
+            (
+                Contribution(group=group, member=member, amount=random.randint(1, 500))
+                for member in members
+                for _ in range(per_member)
+            ),
+            batch_size=1000,
+        )
+        return group
+
+    def _measure_memory(self, build):
+        tracemalloc.start()
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return size
@@ -0,0 +1,69 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+from django.utils import timezone
+
+from contribution.models import Contribution
+from contribution.rows import ROW_FIELDS, format_rows
+from group.models import Group
+from member.models import Member
+
+
+class Command(BaseCommand):
+    help = 'Time the contribution list rendering paths on in-memory rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+
+    def handle(self, *args, **options):
+        template = get_template('contribution/contribution_list.html')
+        for size in options['sizes']:
+            contributions = self._rows(size)
+            tuples = [
+                (c.date, c.member.name, c.group.name, c.amount, c.recorded_via)
+                for c in contributions
+            ]
+            assert len(tuples[0]) == len(ROW_FIELDS)
+            caches['fragments'].clear()
+            context = {
+                'contributions': contributions,
+                'rows_html': None,
+                'row_fragment_timeout': settings.ROW_FRAGMENT_TIMEOUT,
+                'title': 'All Contributions',
+            }
+
+            per_row = self._time(lambda: template.render(context))
+            warm = self._time(lambda: template.render(context))
+            preserialized = self._time(lambda: template.render(dict(context, rows_html=format_rows(tuples))))
+
+            self.stdout.write(
+                f'rows={size:>9}  cold (render + fill cache) {per_row:8.2f}s  '
+                f'fragment cache (warm) {warm:8.2f}s  pre-serialized {preserialized:8.2f}s'
+            )
+
+    def _rows(self, size):
+        now = timezone.now()
+        groups = [Group(pk=i, name=f'Group {i}', cycle_start_date=date.today(), updated_at=now) for i in range(1, 51)]
+        members = [
+            Member(pk=i, group=random.choice(groups), name=f'Member <{i}>', phone_number=str(i), updated_at=now)
+            for i in range(1, 2001)
+        ]
+        rows = []
+        for i in range(1, size + 1):
+            member = random.choice(members)
+            rows.append(Contribution(
+                pk=i, member=member, group=member.group, amount=Decimal(random.randint(1, 500)),
+                date=date.today() - timedelta(days=random.randint(0, 365)), updated_at=now,
+            ))
+        return rows
+
+    def _time(self, render):
+        started = time.perf_counter()
+        render()
+        return time.perf_counter() - started
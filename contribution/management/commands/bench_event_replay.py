@@ -0,0 +1,69 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from contribution.events import balances_as_of, take_snapshot
+from contribution.models import ContributionEvent
+from group.models import Group
+from member.models import Member
+
+
+class Command(BaseCommand):
+    help = 'Compare full event replay against snapshot-plus-tail replay for a long-running group.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=30)
+        parser.add_argument('--weeks', type=int, default=520, help='Weekly meetings of history to generate.')
+        parser.add_argument('--snapshot-every', type=int, default=52, help='Weeks between snapshots.')
+        parser.add_argument('--queries', type=int, default=50)
+
+    def handle(self, *args, **options):
+        # Everything runs inside a transaction that is rolled back at the end.
+        with transaction.atomic():
+            group, start = self._populate(options['members'], options['weeks'], options['snapshot_every'])
+            end = start + timedelta(weeks=options['weeks'])
+            dates = [start + timedelta(days=random.randint(0, (end - start).days)) for _ in range(options['queries'])]
+
+            started = time.perf_counter()
+            full = [balances_as_of(group.pk, d, use_snapshot=False) for d in dates]
+            full_elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            tail = [balances_as_of(group.pk, d) for d in dates]
+            tail_elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        if full != tail:
+            self.stderr.write(self.style.ERROR('Snapshot replay disagrees with full replay.'))
+        events = options['members'] * options['weeks']
+        queries = options['queries']
+        self.stdout.write(f'events={events} weeks={options["weeks"]} snapshot every {options["snapshot_every"]} weeks')
+        self.stdout.write(f'full replay     {full_elapsed / queries * 1000:.2f} ms/query')
+        self.stdout.write(f'snapshot + tail {tail_elapsed / queries * 1000:.2f} ms/query')
+
+    def _populate(self, member_count, weeks, snapshot_every):
+        start = date.today() - timedelta(weeks=weeks)
+        group = Group.objects.create(name='Benchmark group', cycle_start_date=start)
+        members = Member.objects.bulk_create(
+            Member(group=group, name=f'Member {i}', phone_number=f'+2609{i:08d}')
+            for i in range(member_count)
+        )
+        contribution_id = 0
+        for week in range(weeks):
+            meeting = start + timedelta(weeks=week)
+            events = []
+            for member in members:
+                contribution_id += 1
+                events.append(ContributionEvent(
+                    group=group, member=member, contribution_id=contribution_id,
+                    kind=ContributionEvent.CREATED, amount=Decimal(random.randint(10, 200)), date=meeting,
+                ))
+            ContributionEvent.objects.bulk_create(events)
+            if (week + 1) % snapshot_every == 0:
+                take_snapshot(group.pk, meeting)
+        return group, start
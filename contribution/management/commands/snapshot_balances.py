@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from contribution.events import take_snapshot
+from group.models import Group
+
+
+class Command(BaseCommand):
+    help = 'Store a balance snapshot per group so later replays only read the tail of the event log.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--as-of', type=date.fromisoformat, default=None, help='Snapshot date (YYYY-MM-DD), default today.')
+        parser.add_argument('--group', type=int, action='append', dest='groups', help='Limit to these group ids.')
+
+    def handle(self, *args, **options):
+        groups = Group.objects.order_by('id').values_list('id', flat=True)
+        if options['groups']:
+            groups = groups.filter(id__in=options['groups'])
+        taken = 0
+        for group_id in groups.iterator():
+            if take_snapshot(group_id, options['as_of']) is not None:
+                taken += 1
+        self.stdout.write(self.style.SUCCESS(f'Stored {taken} balance snapshots.'))
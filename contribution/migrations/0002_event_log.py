@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_created_events(apps, schema_editor):
+    Contribution = apps.get_model('contribution', 'Contribution')
+    ContributionEvent = apps.get_model('contribution', 'ContributionEvent')
+    rows = Contribution.objects.order_by('id').values_list('id', 'group_id', 'member_id', 'amount', 'date')
+    batch = []
+    for pk, group_id, member_id, amount, date in rows.iterator(chunk_size=2000):
+        batch.append(ContributionEvent(
+            contribution_id=pk, group_id=group_id, member_id=member_id,
+            kind='created', amount=amount, date=date,
+        ))
+        if len(batch) == 2000:
+            ContributionEvent.objects.bulk_create(batch)
+            batch = []
+    ContributionEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contribution', '0001_initial'),
+        ('group', '0001_initial'),
+        ('member', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contribution_id', models.BigIntegerField(db_index=True)),
+                ('kind', models.CharField(choices=[('created', 'Created'), ('amended', 'Amended'), ('reversed', 'Reversed')], max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('date', models.DateField()),
+                ('recorded_at', models.DateTimeField(auto_now_add=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contribution_events', to='group.group')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contribution_events', to='member.member')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'date'], name='contributio_group_i_330f7c_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='GroupBalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+                ('last_event_id', models.BigIntegerField()),
+                ('balances', models.JSONField(default=dict)),
+                ('total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_snapshots', to='group.group')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'as_of'], name='contributio_group_i_ed3e82_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_created_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contribution', '0002_event_log'),
+        ('member', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnomalyCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_contribution_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MemberContributionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('mean', models.FloatField(default=0)),
+                ('variance', models.FloatField(default=0)),
+                ('day', models.DateField(blank=True, null=True)),
+                ('day_count', models.PositiveIntegerField(default=0)),
+                ('last_contribution_id', models.BigIntegerField(default=0)),
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='contribution_stats', to='member.member')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ContributionFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('amount', 'Unusual amount'), ('burst', 'Burst of USSD contributions')], max_length=20)),
+                ('score', models.FloatField()),
+                ('status', models.CharField(choices=[('open', 'Open'), ('confirmed', 'Confirmed'), ('dismissed', 'Dismissed')], default='open', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('contribution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flags', to='contribution.contribution')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contribution_flags', to='member.member')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='contributio_status_9adda7_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contribution', '0003_anomaly_detection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedContribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contribution_id', models.BigIntegerField(unique=True)),
+                ('group_id', models.BigIntegerField(db_index=True)),
+                ('member_id', models.BigIntegerField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date', models.DateField()),
+                ('recorded_via', models.CharField(max_length=20)),
+                ('cycle_closed_on', models.DateField()),
+            ],
+        ),
+    ]
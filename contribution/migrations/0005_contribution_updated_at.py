@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contribution', '0004_archived_contribution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contribution',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contribution', '0005_contribution_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contributionevent',
+            name='kind',
+            field=models.CharField(choices=[('created', 'Created'), ('amended', 'Amended'), ('reversed', 'Reversed'), ('archived', 'Archived')], max_length=10),
+        ),
+    ]
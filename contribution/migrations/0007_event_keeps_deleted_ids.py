@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contribution', '0006_event_kind_archived'),
+        ('group', '0002_updated_at'),
+        ('member', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contributionevent',
+            name='group',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='contribution_events', to='group.group'),
+        ),
+        migrations.AlterField(
+            model_name='contributionevent',
+            name='member',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='contribution_events', to='member.member'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contribution', '0007_event_keeps_deleted_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membercontributionstats',
+            name='recent_ids',
+            field=models.JSONField(default=list),
+        ),
+    ]
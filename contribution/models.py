@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from group.models import Group
 from member.models import Member
 
@@ -8,6 +8,157 @@ class Contribution(models.Model):
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     date = models.DateField(auto_now_add=True)
     recorded_via = models.CharField(max_length=20, choices=[('app', 'App'), ('ussd', 'USSD')], default='app')
+    # Row version for cached list fragments.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # The save and delete signals write the event log; commit it together
+    # with the row so a failed event write also undoes the change.
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so amendments can be logged as a difference.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def __str__(self):
+        return f"{self.member.name} - {self.amount} on {self.date}"
+
+
+class ContributionEvent(models.Model):
+    """Append-only log of changes to a member's balance.
+
+    ``amount`` is the signed change the event makes, so summing the events
+    of a group up to a date gives its balances on that date. Events keep
+    their group and member ids after those rows are deleted, so removing a
+    member or group never rewrites history.
+    """
+    CREATED = 'created'
+    AMENDED = 'amended'
+    REVERSED = 'reversed'
+    ARCHIVED = 'archived'
+    kind_choices = [
+        (CREATED, 'Created'),
+        (AMENDED, 'Amended'),
+        (REVERSED, 'Reversed'),
+        (ARCHIVED, 'Archived'),
+    ]
+    group = models.ForeignKey(
+        Group, on_delete=models.DO_NOTHING, db_constraint=False, related_name='contribution_events',
+    )
+    member = models.ForeignKey(
+        Member, on_delete=models.DO_NOTHING, db_constraint=False, related_name='contribution_events',
+    )
+    contribution_id = models.BigIntegerField(db_index=True)
+    kind = models.CharField(max_length=10, choices=kind_choices)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    date = models.DateField()
+    recorded_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['group', 'date'])]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError('Contribution events are append-only.')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError('Contribution events are append-only.')
+
+    def __str__(self):
+        return f"{self.kind} {self.amount} for contribution {self.contribution_id}"
+
+
+class GroupBalanceSnapshot(models.Model):
+    """Member balances of a group folded from every event up to ``last_event_id``
+    whose date is on or before ``as_of``."""
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='balance_snapshots')
+    as_of = models.DateField()
+    last_event_id = models.BigIntegerField()
+    balances = models.JSONField(default=dict)
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['group', 'as_of'])]
+
+    def __str__(self):
+        return f"{self.group.name} balances as of {self.as_of}"
+
+
+class MemberContributionStats(models.Model):
+    """Running statistics of a member's contributions, updated one row at a time."""
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, related_name='contribution_stats')
+    count = models.PositiveIntegerField(default=0)
+    mean = models.FloatField(default=0)
+    variance = models.FloatField(default=0)
+    day = models.DateField(null=True, blank=True)
+    day_count = models.PositiveIntegerField(default=0)
+    # Every contribution of the member up to this id has been scored; scored
+    # ids above it are kept in recent_ids so late commits are not skipped.
+    last_contribution_id = models.BigIntegerField(default=0)
+    recent_ids = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"Stats for {self.member.name}"
+
+
+class AnomalyCheckpoint(models.Model):
+    """Last contribution id read by the batch detector.
+
+    Bulk imports skip the save signal that drives the streaming detector, so
+    the batch pass keeps its own position instead of trusting the stats rows.
+    """
+    last_contribution_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class ContributionFlag(models.Model):
+    """A contribution queued for treasurer review by the anomaly detector."""
+    reason_choices = [
+        ('amount', 'Unusual amount'),
+        ('burst', 'Burst of USSD contributions'),
+    ]
+    status_choices = [
+        ('open', 'Open'),
+        ('confirmed', 'Confirmed'),
+        ('dismissed', 'Dismissed'),
+    ]
+    contribution = models.ForeignKey(Contribution, on_delete=models.CASCADE, related_name='flags')
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='contribution_flags')
+    reason = models.CharField(max_length=20, choices=reason_choices)
+    score = models.FloatField()
+    status = models.CharField(max_length=20, choices=status_choices, default='open')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.get_reason_display()} on contribution {self.contribution_id}"
+
+
+class ArchivedContribution(models.Model):
+    """A contribution from a closed cycle, moved out of the live table.
+
+    Plain ids instead of foreign keys keep rows small and let the archive
+    outlive the group and members it refers to.
+    """
+    contribution_id = models.BigIntegerField(unique=True)
+    group_id = models.BigIntegerField(db_index=True)
+    member_id = models.BigIntegerField()
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    date = models.DateField()
+    recorded_via = models.CharField(max_length=20)
+    cycle_closed_on = models.DateField()
 
     def __str__(self):
-        return f"{self.member.name} - {self.amount} on {self.date}"
\ No newline at end of file
+        return f"Archived contribution {self.contribution_id} ({self.amount} on {self.date})"
@@ -0,0 +1,31 @@
+from django.utils.formats import date_format
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Contribution
+
+ROW_FIELDS = ('date', 'member__name', 'group__name', 'amount', 'recorded_via')
+# Same labels as get_recorded_via_display().
+RECORDED_VIA = dict(Contribution._meta.get_field('recorded_via').flatchoices)
+ROW_TEMPLATE = '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>'
+
+
+def format_rows(rows):
+    """Render ``ROW_FIELDS`` tuples to the same markup as
+    ``contribution/_contribution_row.html`` without going through the
+    template engine."""
+    # Lists hold few distinct dates, so format each one once.
+    dates = {}
+    lines = []
+    for date, member, group, amount, recorded_via in rows:
+        formatted = dates.get(date)
+        if formatted is None:
+            formatted = dates[date] = date_format(date)
+        lines.append(ROW_TEMPLATE.format(
+            formatted, escape(member), escape(group), amount, RECORDED_VIA.get(recorded_via, recorded_via),
+        ))
+    return mark_safe('\n'.join(lines))
+
+
+def render_contribution_rows(queryset):
+    return format_rows(queryset.values_list(*ROW_FIELDS).iterator(chunk_size=5000))
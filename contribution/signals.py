@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from group.models import Group
+from member.models import Member
+from .anomaly import observe
+from .events import record_amended, record_created, record_reversed
+from .models import Contribution
+from .snapshot import apply_to_snapshot, invalidate_member, invalidate_snapshot, to_cents
+
+TRACKED_FIELDS = ('group_id', 'member_id', 'amount', 'date')
+
+
+def _remember(instance):
+    instance._loaded_values = {name: getattr(instance, name) for name in TRACKED_FIELDS}
+
+
+@receiver(pre_save, sender=Contribution)
+def contribution_saving(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    previous = getattr(instance, '_loaded_values', None) or {}
+    if instance._state.adding or not all(name in previous for name in TRACKED_FIELDS):
+        # Built with an existing pk or loaded with deferred fields; read the
+        # stored values back so an update can still be logged as a difference.
+        instance._loaded_values = Contribution.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+
+
+@receiver(post_save, sender=Contribution)
+def contribution_saved(sender, instance, created, **kwargs):
+    if created:
+        record_created(instance)
+        observe(instance)
+        apply_to_snapshot(instance.group_id, instance.member_id, to_cents(instance.amount))
+        _remember(instance)
+        return
+
+    previous = instance._loaded_values
+    record_amended(instance, previous)
+    apply_to_snapshot(previous['group_id'], previous['member_id'], -to_cents(previous['amount']))
+    apply_to_snapshot(instance.group_id, instance.member_id, to_cents(instance.amount))
+    _remember(instance)
+
+
+@receiver(post_delete, sender=Contribution)
+def contribution_deleted(sender, instance, origin=None, **kwargs):
+    # Only log deletes of contributions themselves. When a member or group
+    # delete cascades here the contributions did happen, so the log keeps
+    # the balance the member held when they were removed.
+    if isinstance(origin, Contribution) or getattr(origin, 'model', None) is Contribution:
+        record_reversed(instance)
+    apply_to_snapshot(instance.group_id, instance.member_id, -to_cents(instance.amount))
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def member_changed(sender, instance, **kwargs):
+    invalidate_member(instance.pk, instance.group_id)
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    invalidate_snapshot(instance.pk)
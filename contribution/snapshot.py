@@ -0,0 +1,158 @@
+import threading
+import time
+from array import array
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+
+from member.models import Member
+
+CENTS = Decimal('0.01')
+
+# Signals only reach the worker that saved the contribution, so snapshots in
+# other workers are rebuilt after this many seconds.
+MAX_AGE = 60
+
+_snapshots = {}
+# Bumped whenever a group's contributions change, so a build that overlaps
+# a change is not cached and a delta is never applied twice.
+_generations = {}
+_lock = threading.Lock()
+
+
+def to_cents(amount):
+    return int(Decimal(amount).quantize(CENTS) * 100)
+
+
+class GroupSnapshot:
+    """Read-mostly view of one group's members and their running totals.
+
+    Member ids and totals (in cents) live in parallel ``array('q')`` columns
+    and phone numbers in a plain list, so a group costs a few bytes per member
+    instead of one model instance per row.
+    """
+
+    __slots__ = ('group_id', 'member_ids', 'phone_numbers', 'totals', '_index', '_by_phone', 'built_at', 'generation')
+
+    def __init__(self, group_id, rows):
+        self.group_id = group_id
+        self.built_at = time.monotonic()
+        self.generation = 0
+        self.member_ids = array('q')
+        self.phone_numbers = []
+        self.totals = array('q')
+        for member_id, phone_number, total in rows:
+            self.member_ids.append(member_id)
+            self.phone_numbers.append(phone_number)
+            self.totals.append(to_cents(total or 0))
+        self._index = {member_id: i for i, member_id in enumerate(self.member_ids)}
+        self._by_phone = {phone: i for i, phone in enumerate(self.phone_numbers)}
+
+    @classmethod
+    def build(cls, group_id):
+        rows = (
+            Member.objects.filter(group_id=group_id)
+            .annotate(total=Sum('contributions__amount', filter=Q(contributions__group_id=group_id)))
+            .order_by('id')
+            .values_list('id', 'phone_number', 'total')
+        )
+        return cls(group_id, rows)
+
+    def __len__(self):
+        return len(self.member_ids)
+
+    def __contains__(self, member_id):
+        return member_id in self._index
+
+    def balance(self, member_id):
+        i = self._index.get(member_id)
+        if i is None:
+            return None
+        return Decimal(self.totals[i]).scaleb(-2)
+
+    def balance_for_phone(self, phone_number):
+        i = self._by_phone.get(phone_number)
+        if i is None:
+            return None
+        return Decimal(self.totals[i]).scaleb(-2)
+
+    def group_total(self):
+        return Decimal(sum(self.totals)).scaleb(-2)
+
+    def apply(self, member_id, cents):
+        i = self._index.get(member_id)
+        if i is None:
+            return False
+        self.totals[i] += cents
+        return True
+
+
+def get_group_snapshot(group_id):
+    snapshot = _snapshots.get(group_id)
+    if snapshot is not None and time.monotonic() - snapshot.built_at <= MAX_AGE:
+        return snapshot
+    generation = _generations.get(group_id, 0)
+    snapshot = GroupSnapshot.build(group_id)
+    snapshot.generation = generation
+    with _lock:
+        # Only cache what no concurrent change could have raced with, and
+        # never a build that may have read this connection's uncommitted rows.
+        if _generations.get(group_id, 0) == generation and not connection.run_on_commit:
+            _snapshots[group_id] = snapshot
+    return snapshot
+
+
+def lookup_balance(phone_number):
+    """Balance of the member with ``phone_number`` through their group's
+    snapshot, or ``None`` for an unknown number."""
+    group_id = Member.objects.filter(phone_number=phone_number).values_list('group_id', flat=True).first()
+    if group_id is None:
+        return None
+    return get_group_snapshot(group_id).balance_for_phone(phone_number)
+
+
+def _bump(group_id):
+    generation = _generations.get(group_id, 0) + 1
+    _generations[group_id] = generation
+    return generation
+
+
+def apply_to_snapshot(group_id, member_id, cents):
+    """Add ``cents`` to a member's cached total once the current transaction
+    commits; nothing happens if it rolls back."""
+    with _lock:
+        pending = _bump(group_id)
+    transaction.on_commit(lambda: _apply(group_id, member_id, cents, pending))
+
+
+def _apply(group_id, member_id, cents, pending):
+    with _lock:
+        _bump(group_id)
+        snapshot = _snapshots.get(group_id)
+        if snapshot is None:
+            return
+        # A snapshot built after the change was saved may already include it;
+        # so may one missing the member (new member or moved). Rebuild both.
+        if snapshot.generation >= pending or not snapshot.apply(member_id, cents):
+            del _snapshots[group_id]
+
+
+def invalidate_member(member_id, group_id):
+    with _lock:
+        _bump(group_id)
+        stale = [gid for gid, snapshot in _snapshots.items() if gid == group_id or member_id in snapshot]
+        for gid in stale:
+            _bump(gid)
+            del _snapshots[gid]
+
+
+def invalidate_snapshot(group_id=None):
+    with _lock:
+        if group_id is None:
+            for gid in list(_generations):
+                _bump(gid)
+            _snapshots.clear()
+        else:
+            _bump(group_id)
+            _snapshots.pop(group_id, None)
@@ -1,3 +1,365 @@
-from django.test import TestCase
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Sum
+from django.test import RequestFactory, TestCase, TransactionTestCase
+
+from group.models import Group
+from member.models import Member
+from .anomaly import BURST_LIMIT, RECENT_IDS, AnomalyDetector, RollingStats, _score
+from .archive import archive_group
+from .events import balances_as_of, take_snapshot
+from .models import (
+    AnomalyCheckpoint, ArchivedContribution, Contribution, ContributionEvent, ContributionFlag, MemberContributionStats,
+)
+from .snapshot import GroupSnapshot, get_group_snapshot, invalidate_snapshot, lookup_balance
+from .views import contribution_list
+
+
+class GroupSnapshotTests(TransactionTestCase):
+    def setUp(self):
+        invalidate_snapshot()
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        self.member = Member.objects.create(group=self.group, name='Ann', phone_number='+260970000001')
+
+    def test_build_sums_contributions_per_member(self):
+        Contribution.objects.create(group=self.group, member=self.member, amount='12.50')
+        Contribution.objects.create(group=self.group, member=self.member, amount='7.50')
+        snapshot = GroupSnapshot.build(self.group.pk)
+        self.assertEqual(snapshot.balance(self.member.pk), Decimal('20.00'))
+        self.assertEqual(snapshot.balance_for_phone('+260970000001'), Decimal('20.00'))
+        self.assertIsNone(snapshot.balance_for_phone('+260979999999'))
+
+    def test_signals_keep_cached_snapshot_current(self):
+        snapshot = get_group_snapshot(self.group.pk)
+        contribution = Contribution.objects.create(group=self.group, member=self.member, amount='50.00')
+        self.assertIs(get_group_snapshot(self.group.pk), snapshot)
+        self.assertEqual(snapshot.balance(self.member.pk), Decimal('50.00'))
+
+        contribution.amount = '30.00'
+        contribution.save()
+        self.assertEqual(get_group_snapshot(self.group.pk).balance(self.member.pk), Decimal('30.00'))
+
+        contribution.delete()
+        self.assertEqual(get_group_snapshot(self.group.pk).balance(self.member.pk), Decimal('0.00'))
+
+    def test_rolled_back_contribution_does_not_reach_snapshot(self):
+        snapshot = get_group_snapshot(self.group.pk)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Contribution.objects.create(group=self.group, member=self.member, amount='50.00')
+                raise RuntimeError
+        self.assertEqual(snapshot.balance(self.member.pk), Decimal('0.00'))
+        self.assertEqual(get_group_snapshot(self.group.pk).balance(self.member.pk), Decimal('0.00'))
+
+    def test_build_overlapping_a_change_is_not_cached(self):
+        with transaction.atomic():
+            Contribution.objects.create(group=self.group, member=self.member, amount='5.00')
+            # Built inside the saving transaction, so it must not be shared.
+            inside = get_group_snapshot(self.group.pk)
+        self.assertIsNot(get_group_snapshot(self.group.pk), inside)
+        self.assertEqual(get_group_snapshot(self.group.pk).balance(self.member.pk), Decimal('5.00'))
+
+    def test_contribution_saved_during_build_is_not_lost(self):
+        build = GroupSnapshot.build.__func__
+
+        def racing_build(cls, group_id):
+            snapshot = build(cls, group_id)
+            Contribution.objects.create(group=self.group, member=self.member, amount='8.00')
+            return snapshot
+
+        with mock.patch.object(GroupSnapshot, 'build', classmethod(racing_build)):
+            stale = get_group_snapshot(self.group.pk)
+        self.assertEqual(stale.balance(self.member.pk), Decimal('0.00'))
+        self.assertEqual(get_group_snapshot(self.group.pk).balance(self.member.pk), Decimal('8.00'))
+
+    def test_new_member_triggers_rebuild(self):
+        get_group_snapshot(self.group.pk)
+        other = Member.objects.create(group=self.group, name='Bwalya', phone_number='+260970000002')
+        Contribution.objects.create(group=self.group, member=other, amount='3.00')
+        self.assertEqual(get_group_snapshot(self.group.pk).balance(other.pk), Decimal('3.00'))
+
+    def test_lookup_balance_by_phone(self):
+        Contribution.objects.create(group=self.group, member=self.member, amount='4.00')
+        self.assertEqual(lookup_balance('+260970000001'), Decimal('4.00'))
+        self.assertIsNone(lookup_balance('+260979999999'))
+
+
+class ContributionEventTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        self.ann = Member.objects.create(group=self.group, name='Ann', phone_number='+260970000001')
+        self.bwalya = Member.objects.create(group=self.group, name='Bwalya', phone_number='+260970000002')
+
+    def kinds(self):
+        return list(ContributionEvent.objects.order_by('id').values_list('kind', 'member_id', 'amount'))
+
+    def test_create_amend_and_delete_are_logged(self):
+        contribution = Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        contribution.amount = '15.00'
+        contribution.save()
+        contribution.member = self.bwalya
+        contribution.save()
+        contribution.delete()
+        self.assertEqual(self.kinds(), [
+            ('created', self.ann.pk, Decimal('10.00')),
+            ('amended', self.ann.pk, Decimal('5.00')),
+            ('reversed', self.ann.pk, Decimal('-15.00')),
+            ('amended', self.bwalya.pk, Decimal('15.00')),
+            ('reversed', self.bwalya.pk, Decimal('-15.00')),
+        ])
+
+    def test_queryset_delete_is_logged(self):
+        Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        Contribution.objects.filter(member=self.ann).delete()
+        self.assertEqual(self.kinds()[-1], ('reversed', self.ann.pk, Decimal('-10.00')))
+
+    def test_saving_instance_built_with_existing_pk_logs_amendment(self):
+        contribution = Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        Contribution(pk=contribution.pk, group=self.group, member=self.ann, amount='12.00', date=contribution.date).save()
+        self.assertEqual(self.kinds()[-1], ('amended', self.ann.pk, Decimal('2.00')))
+
+    def test_deferred_fields_amendment(self):
+        contribution = Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        contribution = Contribution.objects.only('id', 'amount').get(pk=contribution.pk)
+        contribution.amount = '4.00'
+        contribution.save()
+        self.assertEqual(self.kinds()[-1], ('amended', self.ann.pk, Decimal('-6.00')))
+
+    def test_member_delete_keeps_event_history(self):
+        contribution = Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        ann_id = self.ann.pk
+        self.ann.delete()
+        self.assertFalse(Contribution.objects.filter(member_id=ann_id).exists())
+        self.assertEqual(self.kinds(), [('created', ann_id, Decimal('10.00'))])
+        self.assertEqual(balances_as_of(self.group.pk, contribution.date)[ann_id], Decimal('10.00'))
+
+    def test_group_delete_keeps_event_history(self):
+        Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        group_id = self.group.pk
+        self.group.delete()
+        self.assertEqual(ContributionEvent.objects.filter(group_id=group_id).count(), 1)
+        self.assertEqual(balances_as_of(group_id), {self.ann.pk: Decimal('10.00')})
+
+    def test_failed_event_write_rolls_back_save(self):
+        with mock.patch('contribution.signals.record_created', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        self.assertFalse(Contribution.objects.exists())
+
+    def test_failed_event_write_rolls_back_delete(self):
+        contribution = Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        with mock.patch('contribution.signals.record_reversed', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                contribution.delete()
+        self.assertTrue(Contribution.objects.filter(pk=contribution.pk).exists())
+        self.assertEqual(self.kinds(), [('created', self.ann.pk, Decimal('10.00'))])
+
+    def test_snapshot_replay_matches_full_replay(self):
+        start = date(2025, 1, 1)
+        for week in range(10):
+            for member in (self.ann, self.bwalya):
+                contribution = Contribution.objects.create(group=self.group, member=member, amount='5.00')
+                Contribution.objects.filter(pk=contribution.pk).update(date=start + timedelta(weeks=week))
+                ContributionEvent.objects.filter(contribution_id=contribution.pk).update(date=start + timedelta(weeks=week))
+            if week == 4:
+                take_snapshot(self.group.pk, start + timedelta(weeks=week))
+        # Entered after the snapshot but dated inside it.
+        late = Contribution.objects.create(group=self.group, member=self.ann, amount='1.00')
+        ContributionEvent.objects.filter(contribution_id=late.pk).update(date=start)
+
+        for weeks in (0, 4, 6, 9):
+            as_of = start + timedelta(weeks=weeks)
+            self.assertEqual(balances_as_of(self.group.pk, as_of), balances_as_of(self.group.pk, as_of, use_snapshot=False))
+        self.assertEqual(balances_as_of(self.group.pk, start + timedelta(weeks=9))[self.ann.pk], Decimal('51.00'))
+
+    def test_events_are_append_only(self):
+        Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        event = ContributionEvent.objects.get()
+        with self.assertRaises(ValueError):
+            event.save()
+        with self.assertRaises(ValueError):
+            event.delete()
+
+
+class AnomalyDetectionTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        self.member = Member.objects.create(group=self.group, name='Ann', phone_number='+260970000001')
+
+    def contribute(self, amount, recorded_via='app'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Contribution.objects.create(
+                group=self.group, member=self.member, amount=amount, recorded_via=recorded_via,
+            )
+
+    def row(self, contribution):
+        return tuple(getattr(contribution, field) for field in AnomalyDetector.fields)
+
+    def test_unusual_amount_is_flagged(self):
+        for amount in ('50', '52', '48', '51', '49', '50'):
+            self.contribute(amount)
+        self.assertFalse(ContributionFlag.objects.exists())
+        outlier = self.contribute('5000')
+        flag = ContributionFlag.objects.get()
+        self.assertEqual((flag.contribution, flag.reason, flag.status), (outlier, 'amount', 'open'))
+
+    def test_ussd_burst_is_flagged_once_per_day(self):
+        contributions = [self.contribute('50', recorded_via='ussd') for _ in range(BURST_LIMIT + 3)]
+        flag = ContributionFlag.objects.get()
+        self.assertEqual((flag.contribution, flag.reason), (contributions[BURST_LIMIT], 'burst'))
+
+    def test_stats_are_updated_incrementally(self):
+        self.contribute('10')
+        self.contribute('20')
+        stats = MemberContributionStats.objects.get(member=self.member)
+        self.assertEqual(stats.count, 2)
+        self.assertAlmostEqual(stats.mean, 11.0)
+        self.assertEqual(stats.recent_ids, list(Contribution.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_rows_already_seen_are_not_scored_again(self):
+        contribution = self.contribute('10')
+        detector = AnomalyDetector(lock=True)
+        detector.process([(contribution.pk, self.member.pk, Decimal('10'), contribution.date, 'app')])
+        self.assertFalse(detector.dirty)
+        self.assertEqual(MemberContributionStats.objects.get(member=self.member).count, 1)
+
+    def test_contributions_committed_out_of_order_are_scored(self):
+        first, second = Contribution.objects.bulk_create(
+            Contribution(group=self.group, member=self.member, amount=amount) for amount in ('10', '20')
+        )
+        _score(self.row(second))
+        _score(self.row(first))
+        self.assertEqual(MemberContributionStats.objects.get(member=self.member).count, 2)
+        _score(self.row(first))
+        self.assertEqual(MemberContributionStats.objects.get(member=self.member).count, 2)
+
+    def test_only_recent_ids_are_kept(self):
+        state = RollingStats()
+        for contribution_id in range(1, RECENT_IDS + 3):
+            state.update(contribution_id, 10.0, None, 'app')
+        self.assertEqual(state.last_contribution_id, 2)
+        self.assertEqual(len(state.recent_ids), RECENT_IDS)
+        self.assertTrue(state.seen(1))
+        self.assertFalse(state.seen(RECENT_IDS + 3))
+
+    def test_scoring_runs_after_commit_and_cannot_fail_recording(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            contribution = Contribution.objects.create(group=self.group, member=self.member, amount='10')
+        self.assertFalse(MemberContributionStats.objects.exists())
+        with mock.patch.object(AnomalyDetector, 'save', side_effect=RuntimeError):
+            with self.assertLogs('contribution.anomaly', 'ERROR'):
+                for callback in callbacks:
+                    callback()
+        self.assertTrue(Contribution.objects.filter(pk=contribution.pk).exists())
+        self.assertFalse(MemberContributionStats.objects.filter(count__gt=0).exists())
+
+    def test_batch_command_covers_bulk_imports_from_checkpoint(self):
+        Contribution.objects.bulk_create(
+            Contribution(group=self.group, member=self.member, amount='50', recorded_via='ussd')
+            for _ in range(BURST_LIMIT + 1)
+        )
+        call_command('detect_anomalies', stdout=StringIO())
+        self.assertEqual(ContributionFlag.objects.filter(reason='burst').count(), 1)
+        self.assertEqual(MemberContributionStats.objects.get(member=self.member).count, BURST_LIMIT + 1)
+
+        call_command('detect_anomalies', stdout=StringIO())
+        self.assertEqual(MemberContributionStats.objects.get(member=self.member).count, BURST_LIMIT + 1)
+        self.assertEqual(AnomalyCheckpoint.objects.get().last_contribution_id, Contribution.objects.latest('id').pk)
+
+    def test_flags_can_be_reviewed_in_admin(self):
+        self.assertIn(ContributionFlag, admin.site._registry)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2025, 1, 1))
+        self.ann = Member.objects.create(group=self.group, name='Ann', phone_number='+260970000001')
+        for amount in ('10.00', '20.00', '30.00'):
+            contribution = Contribution.objects.create(group=self.group, member=self.ann, amount=amount)
+        ContributionFlag.objects.create(contribution=contribution, member=self.ann, reason='amount', score=5)
+        Contribution.objects.update(date=date(2025, 6, 1))
+        ContributionEvent.objects.update(date=date(2025, 6, 1))
+        self.current = Contribution.objects.create(group=self.group, member=self.ann, amount='5.00')
+        Contribution.objects.filter(pk=self.current.pk).update(date=date(2026, 2, 1))
+        ContributionEvent.objects.filter(contribution_id=self.current.pk).update(date=date(2026, 2, 1))
+        Group.objects.filter(pk=self.group.pk).update(cycle_start_date=date(2026, 1, 1))
+
+    def test_closed_cycle_is_moved_in_chunks(self):
+        flag = ContributionFlag.objects.get()
+        self.assertEqual(archive_group(self.group.pk, chunk_size=1), 2)
+        self.assertEqual(
+            sorted(Contribution.objects.values_list('pk', flat=True)), [flag.contribution_id, self.current.pk],
+        )
+        self.assertEqual(ArchivedContribution.objects.aggregate(total=Sum('amount'))['total'], Decimal('30.00'))
+        self.assertEqual(archive_group(self.group.pk), 0)
+
+    def test_flagged_rows_are_archived_once_reviewed(self):
+        flag = ContributionFlag.objects.get()
+        archive_group(self.group.pk)
+        self.assertTrue(ContributionFlag.objects.filter(pk=flag.pk).exists())
+        ContributionFlag.objects.update(status='dismissed')
+        self.assertEqual(archive_group(self.group.pk), 1)
+        self.assertFalse(ContributionFlag.objects.exists())
+        self.assertEqual(ArchivedContribution.objects.count(), 3)
+
+    def test_event_balances_match_live_balances_after_archiving(self):
+        archive_group(self.group.pk)
+        self.assertEqual(
+            ContributionEvent.objects.filter(kind=ContributionEvent.ARCHIVED).aggregate(total=Sum('amount'))['total'],
+            Decimal('-30.00'),
+        )
+        live = GroupSnapshot.build(self.group.pk).balance(self.ann.pk)
+        self.assertEqual(live, Decimal('35.00'))
+        self.assertEqual(balances_as_of(self.group.pk, date(2026, 2, 1))[self.ann.pk], live)
+        # History before the new cycle is unchanged.
+        self.assertEqual(balances_as_of(self.group.pk, date(2025, 12, 31))[self.ann.pk], Decimal('60.00'))
+
+    def test_new_cycle_waits_for_the_scheduled_command(self):
+        self.group.refresh_from_db()
+        self.group.cycle_start_date = date(2026, 3, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.save()
+        self.assertEqual(ArchivedContribution.objects.count(), 0)
+        out = StringIO()
+        call_command('archive_cycles', stdout=out)
+        self.assertIn('Archived 3 contributions.', out.getvalue())
+        self.assertEqual(Contribution.objects.count(), 1)
+
+
+class ContributionListTests(TestCase):
+    def setUp(self):
+        caches['fragments'].clear()
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        self.ann = Member.objects.create(group=self.group, name='Ann <Banda>', phone_number='+260970000001')
+        Contribution.objects.create(group=self.group, member=self.ann, amount='10.00')
+        Contribution.objects.create(group=self.group, member=self.ann, amount='2.50', recorded_via='ussd')
+        self.user = User.objects.create_user('treasurer', password='x')
+
+    def rows(self):
+        request = RequestFactory().get('/contributions/')
+        request.user = self.user
+        return re.findall(r'<tr><td>.*?</tr>', contribution_list(request).content.decode(), re.S)
+
+    def test_renamed_member_and_group_are_not_served_from_cache(self):
+        self.assertIn('Ann &lt;Banda&gt;', self.rows()[0])
+        self.ann.name = 'Ann Phiri'
+        self.ann.save()
+        self.group.name = 'Tusekelele'
+        self.group.save()
+        for row in self.rows():
+            self.assertIn('Ann Phiri', row)
+            self.assertIn('Tusekelele', row)
+
+    def test_preserialized_rows_match_template_rows(self):
+        rendered = self.rows()
+        with self.settings(PRESERIALIZED_LIST_PAGES=['contribution_list']):
+            self.assertEqual(self.rows(), rendered)
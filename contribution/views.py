@@ -1,20 +1,26 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from .models import Contribution
+from .rows import render_contribution_rows
 from member.models import Member
 from group.models import Group
 
 
 @login_required
 def contribution_list(request):
-    contributions = Contribution.objects.all().order_by('-date', 'member__name')
+    contributions = Contribution.objects.select_related('member', 'group').order_by('-date', 'member__name')
     context = {
         'contributions': contributions,
+        'rows_html': None,
+        'row_fragment_timeout': settings.ROW_FRAGMENT_TIMEOUT,
         'title': 'All Contributions'
     }
+    if 'contribution_list' in settings.PRESERIALIZED_LIST_PAGES:
+        context['rows_html'] = render_contribution_rows(contributions)
     return render(request, 'contribution/contribution_list.html', context)
 
 @login_required
@@ -158,8 +164,15 @@ class ContributionListView(ListView):
     context_object_name = 'contributions'
     ordering = ['-date', 'member__name']
     
+    def get_queryset(self):
+        return super().get_queryset().select_related('member', 'group')
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['rows_html'] = None
+        context['row_fragment_timeout'] = settings.ROW_FRAGMENT_TIMEOUT
+        if 'contribution_list' in settings.PRESERIALIZED_LIST_PAGES:
+            context['rows_html'] = render_contribution_rows(context['contributions'])
         context['title'] = 'All Contributions'
         return context
 
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ('critical', 'normal', 'low')
+REASONS = ('phone_rate', 'gateway_rate', 'overload')
+METRICS_PREFIX = 'ingress:shed'
+
+
+def shed_metrics():
+    """Return ``{'<reason>:<priority>': count}`` for requests refused so far."""
+    cache = caches[settings.INGRESS_METRICS_CACHE]
+    keys = [f'{METRICS_PREFIX}:{reason}:{priority}' for reason in REASONS for priority in PRIORITIES]
+    counts = cache.get_many(keys)
+    return {key[len(METRICS_PREFIX) + 1:]: counts.get(key, 0) for key in keys}
+
+
+class IngressProtectionMiddleware:
+    """Rate limits USSD/SMS gateway callbacks and sheds load by priority.
+
+    Requests under ``INGRESS_PATH_PREFIXES`` draw from a token bucket per
+    phone number and one per gateway. When too many requests are in flight
+    in this worker, ``low`` priority paths (reports, exports) are refused
+    first, then ``normal`` ones; ``critical`` paths such as contribution
+    recording are never shed. Buckets live in the ``INGRESS_CACHE`` cache
+    and every refusal is counted by reason and priority in the
+    ``INGRESS_METRICS_CACHE`` cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cache = caches[settings.INGRESS_CACHE]
+        self.metrics = caches[settings.INGRESS_METRICS_CACHE]
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        priority = self.priority(request.path)
+        reason = self.check_rate(request) or self.admit(priority)
+        if reason:
+            return self.refuse(request, reason, priority)
+
+        try:
+            return self.get_response(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def priority(self, path):
+        for priority, prefixes in settings.INGRESS_PRIORITIES.items():
+            if path.startswith(tuple(prefixes)):
+                return priority
+        return 'normal'
+
+    def check_rate(self, request):
+        if not request.path.startswith(tuple(settings.INGRESS_PATH_PREFIXES)):
+            return None
+        # Africa's Talking sends phoneNumber for USSD and from for SMS.
+        phone_number = request.POST.get('phoneNumber') or request.POST.get('from')
+        gateway = request.META.get('HTTP_X_GATEWAY_ID') or request.META.get('REMOTE_ADDR', '')
+        if phone_number and not self.take_token('phone', phone_number):
+            return 'phone_rate'
+        if not self.take_token('gateway', gateway):
+            return 'gateway_rate'
+        return None
+
+    def admit(self, priority):
+        """Count the request as in flight, or return ``'overload'`` if its
+        priority's threshold is reached. Checking and counting under one lock
+        keeps concurrent requests from overshooting the threshold."""
+        limit = settings.INGRESS_SHED_THRESHOLDS.get(priority)
+        with self.lock:
+            if limit is not None and self.in_flight >= limit:
+                return 'overload'
+            self.in_flight += 1
+        return None
+
+    def take_token(self, kind, key):
+        capacity, per_second = settings.INGRESS_RATE_LIMITS[kind]
+        cache_key = f'ingress:bucket:{kind}:{key}'
+        now = time.time()
+        with self.lock:
+            tokens, updated = self.cache.get(cache_key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # Keep the bucket only as long as it takes to refill completely.
+            self.cache.set(cache_key, (tokens, now), timeout=int(capacity / per_second) + 1)
+        return allowed
+
+    def refuse(self, request, reason, priority):
+        key = f'{METRICS_PREFIX}:{reason}:{priority}'
+        self.metrics.add(key, 0, timeout=None)
+        self.metrics.incr(key)
+        logger.warning('Shed %s request to %s (%s)', priority, request.path, reason)
+
+        if reason == 'overload':
+            response = HttpResponse('Service busy, please try again shortly.', status=503, content_type='text/plain')
+        else:
+            response = HttpResponse('Too many requests.', status=429, content_type='text/plain')
+        response['Retry-After'] = str(settings.INGRESS_RETRY_AFTER)
+        return response
@@ -37,10 +37,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'group',
+    'member',
+    'contribution',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.IngressProtectionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,6 +70,13 @@ TEMPLATES = [
     },
 ]
 
+# List pages (by view name, e.g. 'contribution_list') that build their rows
+# from values_list tuples instead of rendering a template per row.
+PRESERIALIZED_LIST_PAGES = []
+
+# Seconds a rendered list row stays in the 'fragments' cache.
+ROW_FRAGMENT_TIMEOUT = 600
+
 WSGI_APPLICATION = 'core.wsgi.application'
 
 
@@ -80,6 +91,61 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # One token bucket per active phone number, so room for a busy hour.
+    'ingress': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ingress',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Shed counters kept apart from the buckets so culling never drops them.
+    'ingress_metrics': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ingress_metrics',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragments',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+
+# USSD/SMS ingress protection (core.middleware.IngressProtectionMiddleware)
+
+INGRESS_CACHE = 'ingress'
+
+INGRESS_METRICS_CACHE = 'ingress_metrics'
+
+INGRESS_PATH_PREFIXES = ['/ussd/', '/sms/']
+
+# (burst size, tokens refilled per second)
+INGRESS_RATE_LIMITS = {
+    'phone': (10, 0.5),
+    'gateway': (200, 100),
+}
+
+# Paths not listed are 'normal'.
+INGRESS_PRIORITIES = {
+    'critical': ['/ussd/', '/sms/', '/contributions/create/'],
+    'low': ['/reports/', '/exports/'],
+}
+
+# Requests in flight per worker at which each priority starts being shed.
+INGRESS_SHED_THRESHOLDS = {
+    'low': 8,
+    'normal': 32,
+}
+
+INGRESS_RETRY_AFTER = 5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
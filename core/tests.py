@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .middleware import IngressProtectionMiddleware, shed_metrics
+
+
+@override_settings(
+    INGRESS_RATE_LIMITS={'phone': (3, 0.001), 'gateway': (1000, 1000)},
+    INGRESS_SHED_THRESHOLDS={'low': 1, 'normal': 2},
+)
+class IngressProtectionTests(SimpleTestCase):
+    def setUp(self):
+        caches['ingress'].clear()
+        caches['ingress_metrics'].clear()
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.factory = RequestFactory()
+        self.middleware = IngressProtectionMiddleware(lambda request: HttpResponse('ok'))
+
+    def ussd(self, phone_number):
+        return self.middleware(self.factory.post('/ussd/', {'phoneNumber': phone_number}))
+
+    def test_phone_over_its_burst_gets_429(self):
+        statuses = [self.ussd('+260970000001').status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        self.assertEqual(self.ussd('+260970000002').status_code, 200)
+        refused = self.ussd('+260970000001')
+        self.assertEqual(refused['Retry-After'], '5')
+        self.assertEqual(shed_metrics()['phone_rate:critical'], 2)
+
+    def test_overload_sheds_low_then_normal_but_never_critical(self):
+        self.middleware.in_flight = 1
+        self.assertEqual(self.middleware(self.factory.get('/reports/')).status_code, 503)
+        self.assertEqual(self.middleware(self.factory.get('/members/')).status_code, 200)
+        self.middleware.in_flight = 100
+        self.assertEqual(self.middleware(self.factory.get('/members/')).status_code, 503)
+        self.assertEqual(self.middleware(self.factory.post('/contributions/create/')).status_code, 200)
+        self.assertEqual(self.middleware.in_flight, 100)
+        metrics = shed_metrics()
+        self.assertEqual((metrics['overload:low'], metrics['overload:normal'], metrics['overload:critical']), (1, 1, 0))
+
+    def test_concurrent_requests_do_not_overshoot_threshold(self):
+        release = threading.Event()
+        peak = []
+
+        def slow_view(request):
+            peak.append(self.middleware.in_flight)
+            release.wait(5)
+            return HttpResponse('ok')
+
+        self.middleware.get_response = slow_view
+        statuses = []
+        threads = [
+            threading.Thread(target=lambda: statuses.append(self.middleware(self.factory.get('/members/')).status_code))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        # Hold the admitted requests until every other one has been refused.
+        deadline = time.monotonic() + 5
+        while len(statuses) < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual((statuses, self.middleware.in_flight), ([503] * 6, 2))
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(statuses), [200, 200] + [503] * 6)
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(self.middleware.in_flight, 0)
+
+    def test_shed_counts_survive_bucket_culling(self):
+        for _ in range(4):
+            self.ussd('+260970000001')
+        bucket_cache = caches['ingress']
+        for i in range(bucket_cache._max_entries + 10):
+            bucket_cache.set(f'ingress:bucket:phone:{i}', (1, 0))
+        self.assertEqual(shed_metrics()['phone_rate:critical'], 1)
@@ -0,0 +1,9 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .middleware import shed_metrics
+
+
+@staff_member_required
+def ingress_metrics(request):
+    return JsonResponse({'shed': shed_metrics()})
@@ -0,0 +1,49 @@
+from django.db import models, transaction
+
+CHUNK_SIZE = 1000
+
+
+def _delete_in_chunks(queryset, chunk_size):
+    """Delete ``queryset`` and, first, every row that cascades from it.
+
+    Dependants are found through the model's reverse relations and removed
+    ``chunk_size`` primary keys at a time with raw ``DELETE`` statements, so
+    memory and lock time stay bounded however large the tree is.
+    """
+    model = queryset.model
+    for relation in model._meta.related_objects:
+        if relation.on_delete is models.DO_NOTHING:
+            continue
+        if relation.on_delete is not models.CASCADE:
+            raise ValueError(
+                f'{relation.related_model.__name__}.{relation.field.name} does not cascade; '
+                f'delete {model.__name__} through the ORM instead.'
+            )
+        dependants = relation.related_model._base_manager.using(queryset.db).filter(
+            **{f'{relation.field.name}__in': queryset}
+        )
+        _delete_in_chunks(dependants, chunk_size)
+
+    deleted = 0
+    while True:
+        with transaction.atomic(using=queryset.db):
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                return deleted
+            model._base_manager.using(queryset.db).filter(pk__in=ids)._raw_delete(queryset.db)
+        deleted += len(ids)
+
+
+def delete_group(group, chunk_size=CHUNK_SIZE):
+    """Delete a group with its members, contributions and everything else
+    that cascades from it, one chunk per transaction.
+
+    Only the final delete of the group row goes through ``Model.delete()``,
+    so ``pre_delete``/``post_delete`` still fire for the group itself.
+    If interrupted, calling it again finishes the job.
+    """
+    for relation in group._meta.related_objects:
+        if relation.on_delete is models.CASCADE:
+            dependants = relation.related_model._base_manager.filter(**{relation.field.name: group})
+            _delete_in_chunks(dependants, chunk_size)
+    group.delete()
@@ -4,6 +4,8 @@ class Group(models.Model):
     name = models.CharField(max_length=255)
     cycle_start_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Row version for cached contribution list fragments.
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
\ No newline at end of file
@@ -1,3 +1,44 @@
+from datetime import date
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from contribution.models import Contribution, ContributionEvent, ContributionFlag
+from member.models import Member
+from .deletion import delete_group
+from .models import Group
+
+
+class DeleteGroupTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        self.other = Group.objects.create(name='Tusekelele', cycle_start_date=date(2026, 1, 1))
+        for group in (self.group, self.other):
+            for i in range(5):
+                member = Member.objects.create(group=group, name=f'Member {i}', phone_number=f'+26097{group.pk}{i:06d}')
+                for _ in range(3):
+                    contribution = Contribution.objects.create(group=group, member=member, amount='10.00')
+                ContributionFlag.objects.create(contribution=contribution, member=member, reason='amount', score=5)
+
+    def test_group_and_dependants_are_deleted_in_chunks(self):
+        group_id = self.group.pk
+        delete_group(self.group, chunk_size=2)
+        self.assertFalse(Group.objects.filter(pk=group_id).exists())
+        self.assertFalse(Member.objects.filter(group_id=group_id).exists())
+        self.assertFalse(Contribution.objects.filter(group_id=group_id).exists())
+        self.assertFalse(ContributionFlag.objects.filter(member__group_id=group_id).exists())
+        # The event log is history and outlives the group.
+        self.assertEqual(ContributionEvent.objects.filter(group_id=group_id).count(), 15)
+
+    def test_other_groups_are_untouched(self):
+        delete_group(self.group, chunk_size=2)
+        self.assertEqual(Member.objects.filter(group=self.other).count(), 5)
+        self.assertEqual(Contribution.objects.filter(group=self.other).count(), 15)
+        self.assertEqual(ContributionEvent.objects.filter(group=self.other).count(), 15)
+        self.assertEqual(ContributionFlag.objects.filter(member__group=self.other).count(), 5)
+
+    def test_group_delete_signal_still_fires(self):
+        group_id = self.group.pk
+        with mock.patch('member.signals.invalidate_member_trie') as invalidate:
+            delete_group(self.group, chunk_size=2)
+        invalidate.assert_called_with(group_id)
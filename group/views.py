@@ -1,8 +1,10 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from .deletion import delete_group
 from .models import Group
 
 
@@ -82,7 +84,7 @@ def group_delete(request, pk):
     
     if request.method == 'POST':
         group_name = group.name
-        group.delete()
+        delete_group(group)
         messages.success(request, f'Group {group_name} deleted successfully!')
         return redirect('group_list')
     
@@ -155,6 +157,12 @@ class GroupDeleteView(DeleteView):
         return context
     
     def delete(self, request, *args, **kwargs):
+        self.object = self.get_object()
         group_name = self.object.name
+        success_url = self.get_success_url()
+        delete_group(self.object)
         messages.success(request, f'Group {group_name} deleted successfully!')
-        return super().delete(request, *args, **kwargs)
+        return HttpResponseRedirect(success_url)
+
+    def form_valid(self, form):
+        return self.delete(self.request)
@@ -0,0 +1,68 @@
+import random
+import string
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from group.models import Group
+from member.models import Member
+from member.search import MemberTrie, search_members
+
+FIRST_NAMES = ['Mary', 'John', 'Grace', 'Peter', 'Ruth', 'Joseph', 'Esther', 'Moses', 'Agnes', 'Daniel']
+
+
+class Command(BaseCommand):
+    help = 'Measure as-you-type member search latency for one group in a large member table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=1_000_000, help='Members across all groups.')
+        parser.add_argument('--group-size', type=int, default=200)
+        parser.add_argument('--queries', type=int, default=500)
+
+    def handle(self, *args, **options):
+        # Everything runs inside a transaction that is rolled back at the end.
+        with transaction.atomic():
+            group_ids = self._populate(options['members'], options['group_size'])
+            queries = [
+                (random.choice(group_ids), random.choice(FIRST_NAMES)[:random.randint(1, 4)])
+                for _ in range(options['queries'])
+            ]
+
+            started = time.perf_counter()
+            for group_id, query in queries:
+                search_members(group_id, query)
+            db_elapsed = time.perf_counter() - started
+
+            tries = {group_id: MemberTrie.build(group_id) for group_id in {g for g, _ in queries}}
+            started = time.perf_counter()
+            for group_id, query in queries:
+                tries[group_id].search(query)
+            trie_elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        count = options['queries']
+        self.stdout.write(f'members={options["members"]} vendor={connection.vendor}')
+        self.stdout.write(f'search_members {db_elapsed / count * 1000:.2f} ms/query')
+        self.stdout.write(f'in-memory trie {trie_elapsed / count * 1000:.3f} ms/query')
+
+    def _populate(self, member_count, group_size):
+        group_count = max(1, member_count // group_size)
+        groups = Group.objects.bulk_create(
+            Group(name=f'Benchmark group {i}', cycle_start_date=date.today()) for i in range(group_count)
+        )
+        batch = []
+        for i in range(member_count):
+            surname = ''.join(random.choices(string.ascii_lowercase, k=6)).title()
+            batch.append(Member(
+                group=groups[i % group_count],
+                name=f'{random.choice(FIRST_NAMES)} {surname}',
+                phone_number=f'+26{i:010d}',
+            ))
+            if len(batch) == 5000:
+                Member.objects.bulk_create(batch)
+                batch = []
+        Member.objects.bulk_create(batch)
+        return [group.pk for group in groups]
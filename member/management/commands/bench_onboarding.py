@@ -0,0 +1,47 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from group.models import Group
+from member.models import Member
+from member.onboarding import onboard_members
+
+
+class Command(BaseCommand):
+    help = 'Compare batch onboarding against creating members one form post at a time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = options['members']
+        # Everything runs inside a transaction that is rolled back at the end.
+        with transaction.atomic():
+            group = Group.objects.create(name='Benchmark group', cycle_start_date=date.today())
+            rows = [
+                {'name': f'Member {i}', 'phone_number': f'+2607{i:08d}', 'role': 'member'}
+                for i in range(count)
+            ]
+
+            # What member_create does for every posted form.
+            started = time.perf_counter()
+            for row in rows:
+                try:
+                    with transaction.atomic():
+                        Member.objects.create(group=Group.objects.get(id=group.pk), **row)
+                except Exception:
+                    pass
+            per_row_elapsed = time.perf_counter() - started
+            Member.objects.filter(group=group).delete()
+
+            started = time.perf_counter()
+            created, errors = onboard_members(group, rows)
+            batch_elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'members={count} created={len(created)} errors={len(errors)}')
+        self.stdout.write(f'per-row  {count / per_row_elapsed:.0f} members/s')
+        self.stdout.write(f'batch    {count / batch_elapsed:.0f} members/s')
@@ -0,0 +1,42 @@
+import csv
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from group.models import Group
+from member.onboarding import onboard_members
+
+
+class Command(BaseCommand):
+    help = 'Onboard members from a CSV file with name, phone_number and optional role columns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument('--group', type=int, help='Id of an existing group.')
+        parser.add_argument('--group-name', help='Create a new group with this name.')
+        parser.add_argument('--cycle-start-date', type=date.fromisoformat, help='Cycle start (YYYY-MM-DD) for a new group.')
+
+    def handle(self, *args, **options):
+        with open(options['csv_file'], newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+
+        with transaction.atomic():
+            if options['group']:
+                try:
+                    group = Group.objects.get(pk=options['group'])
+                except Group.DoesNotExist:
+                    raise CommandError(f'Group {options["group"]} does not exist.')
+            elif options['group_name'] and options['cycle_start_date']:
+                group = Group.objects.create(name=options['group_name'], cycle_start_date=options['cycle_start_date'])
+            else:
+                raise CommandError('Pass --group, or --group-name with --cycle-start-date.')
+            created, errors = onboard_members(group, rows)
+
+        for index, row_errors in sorted(errors.items()):
+            # Report CSV line numbers: the header is line 1.
+            details = '; '.join(f'{field}: {message}' for field, message in row_errors.items())
+            self.stderr.write(f'line {index + 2}: {details}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Onboarded {len(created)} members into {group.name}; {len(errors)} rows skipped.'
+        ))
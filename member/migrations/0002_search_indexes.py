@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:15
+
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE member_member_fts USING fts5(
+        group_id, name, phone_number, content='member_member', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER member_member_fts_ai AFTER INSERT ON member_member BEGIN
+        INSERT INTO member_member_fts(rowid, group_id, name, phone_number) VALUES (new.id, new.group_id, new.name, new.phone_number);
+    END""",
+    """CREATE TRIGGER member_member_fts_ad AFTER DELETE ON member_member BEGIN
+        INSERT INTO member_member_fts(member_member_fts, rowid, group_id, name, phone_number)
+        VALUES ('delete', old.id, old.group_id, old.name, old.phone_number);
+    END""",
+    """CREATE TRIGGER member_member_fts_au AFTER UPDATE ON member_member BEGIN
+        INSERT INTO member_member_fts(member_member_fts, rowid, group_id, name, phone_number)
+        VALUES ('delete', old.id, old.group_id, old.name, old.phone_number);
+        INSERT INTO member_member_fts(rowid, group_id, name, phone_number) VALUES (new.id, new.group_id, new.name, new.phone_number);
+    END""",
+    "INSERT INTO member_member_fts(member_member_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS member_member_fts_ai',
+    'DROP TRIGGER IF EXISTS member_member_fts_ad',
+    'DROP TRIGGER IF EXISTS member_member_fts_au',
+    'DROP TABLE IF EXISTS member_member_fts',
+]
+POSTGRESQL_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX member_member_name_trgm ON member_member USING gin (name gin_trgm_ops)',
+    'CREATE INDEX member_member_phone_trgm ON member_member USING gin (phone_number gin_trgm_ops)',
+]
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS member_member_name_trgm',
+    'DROP INDEX IF EXISTS member_member_phone_trgm',
+]
+
+
+def _run(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def create_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            compile_options = {row[0] for row in cursor.fetchall()}
+        if 'ENABLE_FTS5' in compile_options:
+            _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRESQL_FORWARD)
+
+
+def drop_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRESQL_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0001_initial'),
+        ('member', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['group', 'name'], name='member_memb_group_i_541ce8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['group', 'phone_number'], name='member_memb_group_i_12d418_idx'),
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+    ]
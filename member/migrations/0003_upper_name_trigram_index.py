@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# istartswith/icontains compile to UPPER(name) LIKE UPPER(...) on PostgreSQL,
+# which only an index on UPPER(name) can serve.
+FORWARD = [
+    'DROP INDEX IF EXISTS member_member_name_trgm',
+    'CREATE INDEX member_member_name_upper_trgm ON member_member USING gin (UPPER(name) gin_trgm_ops)',
+]
+BACKWARD = [
+    'DROP INDEX IF EXISTS member_member_name_upper_trgm',
+    'CREATE INDEX member_member_name_trgm ON member_member USING gin (name gin_trgm_ops)',
+]
+
+
+def _run(schema_editor, statements):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def forward(apps, schema_editor):
+    _run(schema_editor, FORWARD)
+
+
+def backward(apps, schema_editor):
+    _run(schema_editor, BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forward, backward),
+    ]
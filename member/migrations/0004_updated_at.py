@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:33
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# SQLite adds the column by rebuilding member_member, which drops the
+# triggers that keep the full-text index in sync; recreate them after.
+search_indexes = import_module('member.migrations.0002_search_indexes')
+
+
+def drop_sqlite_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        search_indexes.drop_text_index(apps, schema_editor)
+
+
+def create_sqlite_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        search_indexes.create_text_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0003_upper_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_sqlite_triggers, create_sqlite_triggers),
+        migrations.AddField(
+            model_name='member',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(create_sqlite_triggers, drop_sqlite_triggers),
+    ]
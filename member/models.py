@@ -12,6 +12,14 @@ class Member(models.Model):
     ]
     role = models.CharField(max_length=20, choices=role_choices, default='member')
     joined_at = models.DateTimeField(auto_now_add=True)
+    # Row version for cached contribution list fragments.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['group', 'name']),
+            models.Index(fields=['group', 'phone_number']),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.group.name})"
\ No newline at end of file
@@ -0,0 +1,99 @@
+from django.db import IntegrityError, transaction
+
+from contribution.snapshot import invalidate_snapshot
+from .models import Member
+from .search import invalidate_member_trie
+
+ROLES = {value for value, _ in Member.role_choices}
+
+
+def _text(row, field, row_errors):
+    """Return ``row[field]`` as stripped text, accepting numbers (phone
+    numbers often arrive as JSON integers) and recording other types as an
+    error."""
+    value = row.get(field)
+    if value is None:
+        return ''
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        row_errors[field] = 'Enter a text value.'
+        return ''
+    return str(value).strip()
+
+
+def validate_rows(rows):
+    """Check onboarding rows and return ``(members, errors)``.
+
+    ``members`` pairs each valid row index with an unsaved ``Member`` (group
+    not yet set) and ``errors`` maps row indexes to field errors. Phone
+    numbers already in use are found with a single ``IN`` query.
+    """
+    members = []
+    errors = {}
+    seen = set()
+    name_length = Member._meta.get_field('name').max_length
+    phone_length = Member._meta.get_field('phone_number').max_length
+
+    for index, row in enumerate(rows):
+        row_errors = {}
+        name = _text(row, 'name', row_errors)
+        phone_number = _text(row, 'phone_number', row_errors)
+        role = _text(row, 'role', row_errors) or 'member'
+        if row_errors:
+            errors[index] = row_errors
+            continue
+        if not name:
+            row_errors['name'] = 'This field is required.'
+        elif len(name) > name_length:
+            row_errors['name'] = f'Ensure this value has at most {name_length} characters.'
+        if not phone_number:
+            row_errors['phone_number'] = 'This field is required.'
+        elif len(phone_number) > phone_length:
+            row_errors['phone_number'] = f'Ensure this value has at most {phone_length} characters.'
+        elif phone_number in seen:
+            row_errors['phone_number'] = 'Phone number appears more than once in this batch.'
+        else:
+            seen.add(phone_number)
+        if role not in ROLES:
+            row_errors['role'] = f'Select a valid choice. {role} is not one of the available choices.'
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            members.append((index, Member(name=name, phone_number=phone_number, role=role)))
+
+    taken = set(
+        Member.objects.filter(phone_number__in=[m.phone_number for _, m in members])
+        .values_list('phone_number', flat=True)
+    )
+    if taken:
+        for index, member in members:
+            if member.phone_number in taken:
+                errors[index] = {'phone_number': 'Member with this Phone number already exists.'}
+        members = [(index, member) for index, member in members if index not in errors]
+    return members, errors
+
+
+def onboard_members(group, rows, batch_size=500):
+    """Create the valid rows as members of ``group`` in one transaction.
+
+    Returns ``(created, errors)``: the new members in row order and a dict of
+    per-row field errors for rows that were skipped.
+    """
+    rows = list(rows)
+    for attempt in range(2):
+        members, errors = validate_rows(rows)
+        for _, member in members:
+            member.group = group
+        try:
+            with transaction.atomic():
+                created = Member.objects.bulk_create([member for _, member in members], batch_size=batch_size)
+            break
+        except IntegrityError:
+            # Another request took one of the phone numbers after the check;
+            # validate again so it is reported against its row.
+            if attempt:
+                raise
+
+    # bulk_create skips post_save, so drop the caches it would have cleared.
+    invalidate_member_trie(group.pk)
+    invalidate_snapshot(group.pk)
+    return created, errors
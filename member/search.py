@@ -0,0 +1,167 @@
+import re
+import threading
+import unicodedata
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Member
+
+MAX_RESULTS = 20
+
+_tries = {}
+# Bumped by every invalidation, so a trie built across a member change is
+# not cached.
+_generation = 0
+_lock = threading.Lock()
+_fts_available = None
+
+WORD = re.compile(r'[^\W_]+')
+
+
+def tokenize(text):
+    """Split text the way the FTS5 ``unicode61`` tokenizer does: case and
+    diacritics folded, anything but letters and digits (``_`` and ``+``
+    included) a separator. The trie and the SQLite FTS table therefore agree;
+    the PostgreSQL trigram search compares stored text and stays accent
+    sensitive."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return WORD.findall(''.join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+class MemberTrie:
+    """Prefix index over one group's member names and phone numbers.
+
+    Every node lists all member ids below it in name order, so a term costs
+    one step per typed character and terms are combined by intersection.
+    """
+
+    __slots__ = ('root', 'members')
+
+    def __init__(self, rows):
+        self.root = {}
+        self.members = {}
+        for member_id, name, phone_number in rows:
+            self.members[member_id] = (name, phone_number)
+            for key in set(tokenize(name) + tokenize(phone_number)):
+                self._insert(key, member_id)
+
+    def _insert(self, key, member_id):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+            ids = node.setdefault('', [])
+            # Keys of one member are inserted together, so a repeat is last.
+            if not ids or ids[-1] != member_id:
+                ids.append(member_id)
+
+    @classmethod
+    def build(cls, group_id):
+        rows = Member.objects.filter(group_id=group_id).order_by('name').values_list('id', 'name', 'phone_number')
+        return cls(rows)
+
+    def _lookup(self, term):
+        node = self.root
+        for char in term:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node['']
+
+    def search(self, query, limit=MAX_RESULTS):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        matches = sorted((self._lookup(term) for term in terms), key=len)
+        others = [set(ids) for ids in matches[1:]]
+        results = []
+        for member_id in matches[0]:
+            if all(member_id in ids for ids in others):
+                name, phone_number = self.members[member_id]
+                results.append({'id': member_id, 'name': name, 'phone_number': phone_number})
+                if len(results) == limit:
+                    break
+        return results
+
+
+def get_member_trie(group_id):
+    trie = _tries.get(group_id)
+    if trie is None:
+        generation = _generation
+        trie = MemberTrie.build(group_id)
+        with _lock:
+            # Skip caching if a member changed during the build, or if this
+            # connection has uncommitted changes other threads must not see.
+            if _generation == generation and not connection.run_on_commit:
+                _tries[group_id] = trie
+    return trie
+
+
+def _drop(group_id):
+    global _generation
+    with _lock:
+        _generation += 1
+        if group_id is None:
+            _tries.clear()
+        else:
+            _tries.pop(group_id, None)
+
+
+def invalidate_member_trie(group_id=None):
+    """Drop cached tries now and again once the current transaction commits,
+    so a trie built from the old rows in between is not kept."""
+    _drop(group_id)
+    transaction.on_commit(lambda: _drop(group_id))
+
+
+def _has_fts():
+    global _fts_available
+    if _fts_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'member_member_fts'")
+            _fts_available = cursor.fetchone() is not None
+    return _fts_available
+
+
+def _search_fts(group_id, terms, limit):
+    # Terms are word characters only, so quoting keeps them literal.
+    prefixes = ' '.join('"%s"*' % term for term in terms)
+    match = 'group_id : "%d" AND {name phone_number} : (%s)' % (int(group_id), prefixes)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT m.id, m.name, m.phone_number FROM member_member_fts f '
+            'JOIN member_member m ON m.id = f.rowid '
+            'WHERE member_member_fts MATCH %s '
+            'ORDER BY m.name LIMIT %s',
+            [match, limit],
+        )
+        rows = cursor.fetchall()
+    return [{'id': pk, 'name': name, 'phone_number': phone} for pk, name, phone in rows]
+
+
+def _search_trigram(group_id, terms, limit):
+    members = Member.objects.filter(group_id=group_id)
+    for term in terms:
+        # Compiles to UPPER(name) LIKE ..., served by the UPPER(name) trigram index.
+        members = members.filter(
+            Q(name__istartswith=term) | Q(name__icontains=' ' + term)
+            | Q(phone_number__startswith=term) | Q(phone_number__startswith='+' + term)
+        )
+    return list(members.order_by('name').values('id', 'name', 'phone_number')[:limit])
+
+
+def search_members(group_id, query, limit=MAX_RESULTS):
+    """Return up to ``limit`` members of a group whose name words or phone
+    number start with every term in ``query``.
+
+    Uses the FTS5 table on SQLite and the trigram indexes on PostgreSQL that
+    the search migration creates, and an in-memory trie elsewhere.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return []
+    if connection.vendor == 'sqlite' and _has_fts():
+        return _search_fts(group_id, terms, limit)
+    if connection.vendor == 'postgresql':
+        return _search_trigram(group_id, terms, limit)
+    return get_member_trie(group_id).search(query, limit)
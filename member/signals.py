@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from group.models import Group
+from .models import Member
+from .search import invalidate_member_trie
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def member_changed(sender, instance, **kwargs):
+    # A member moved between groups stays in the old group's trie, so drop
+    # every cached trie on updates.
+    if kwargs.get('created'):
+        invalidate_member_trie(instance.group_id)
+    else:
+        invalidate_member_trie()
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    invalidate_member_trie(instance.pk)
@@ -1,3 +1,158 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from group.models import Group
+from .models import Member
+from .onboarding import onboard_members
+from .search import MemberTrie, get_member_trie, invalidate_member_trie, search_members
+
+
+class MemberSearchTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        self.other_group = Group.objects.create(name='Tusekelele', cycle_start_date=date(2026, 1, 1))
+        for i in range(30):
+            Member.objects.create(group=self.group, name=f'Mary A{i:02d}', phone_number=f'+26097000{i:04d}')
+        self.zulu = Member.objects.create(group=self.group, name='Mary Zulu', phone_number='+260966000001')
+        Member.objects.create(group=self.other_group, name='Mary Zulu Banda', phone_number='+260955000001')
+
+    def names(self, results):
+        return [row['name'] for row in results]
+
+    def test_results_are_scoped_to_group(self):
+        self.assertEqual(self.names(search_members(self.group.pk, 'zu')), ['Mary Zulu'])
+        self.assertEqual(self.names(search_members(self.other_group.pk, 'zu')), ['Mary Zulu Banda'])
+
+    def test_every_term_must_match_a_word_prefix(self):
+        self.assertEqual(self.names(search_members(self.group.pk, 'mary zu')), ['Mary Zulu'])
+        self.assertEqual(search_members(self.group.pk, 'mary zx'), [])
+
+    def test_phone_prefix_with_or_without_plus(self):
+        self.assertEqual(self.names(search_members(self.group.pk, '+26096')), ['Mary Zulu'])
+        self.assertEqual(self.names(search_members(self.group.pk, '26096')), ['Mary Zulu'])
+
+    def test_results_are_limited_and_ordered_by_name(self):
+        results = self.names(search_members(self.group.pk, 'mary'))
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results, sorted(results))
+
+    def test_trie_matches_database_search(self):
+        trie = MemberTrie.build(self.group.pk)
+        for query in ('mary zu', 'zu mary', '+26096', '26097000002', 'a0', 'mary', 'nobody'):
+            with self.subTest(query=query):
+                self.assertEqual(trie.search(query), search_members(self.group.pk, query))
+
+    def test_diacritics_and_underscores_fold_like_fts(self):
+        jose = Member.objects.create(group=self.group, name='José Mwale', phone_number='+260977000001')
+        Member.objects.create(group=self.group, name='Mary_Ann Phiri', phone_number='+260977000002')
+        trie = MemberTrie.build(self.group.pk)
+        for query, expected in (('jose', ['José Mwale']), ('JOSÉ mw', ['José Mwale']), ('ann', ['Mary_Ann Phiri'])):
+            with self.subTest(query=query):
+                self.assertEqual(self.names(search_members(self.group.pk, query)), expected)
+                self.assertEqual(trie.search(query), search_members(self.group.pk, query))
+        self.assertEqual(trie.search('jose')[0]['id'], jose.pk)
+
+    def test_trie_is_rebuilt_after_member_changes(self):
+        get_member_trie(self.group.pk)
+        self.zulu.name = 'Mary Phiri'
+        self.zulu.save()
+        self.assertEqual(self.names(get_member_trie(self.group.pk).search('phi')), ['Mary Phiri'])
+
+    def test_search_endpoint(self):
+        self.client.force_login(User.objects.create_user('treasurer', password='x'))
+        response = self.client.get(f'/groups/{self.group.pk}/members/search/', {'q': 'mary zu'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'results': [
+            {'id': self.zulu.pk, 'name': 'Mary Zulu', 'phone_number': '+260966000001'},
+        ]})
+
+
+class MemberTrieCacheTests(TransactionTestCase):
+    def setUp(self):
+        invalidate_member_trie()
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        Member.objects.create(group=self.group, name='Ann', phone_number='+260970000001')
+
+    def test_trie_is_cached_between_changes(self):
+        self.assertIs(get_member_trie(self.group.pk), get_member_trie(self.group.pk))
+
+    def test_member_saved_during_build_is_not_lost(self):
+        build = MemberTrie.build.__func__
+
+        def racing_build(cls, group_id):
+            trie = build(cls, group_id)
+            Member.objects.create(group=self.group, name='Bwalya', phone_number='+260970000002')
+            return trie
+
+        with mock.patch.object(MemberTrie, 'build', classmethod(racing_build)):
+            stale = get_member_trie(self.group.pk)
+        self.assertEqual(stale.search('bw'), [])
+        self.assertEqual(len(get_member_trie(self.group.pk).search('bw')), 1)
+
+
+class MemberOnboardingTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name='Tiyende', cycle_start_date=date(2026, 1, 1))
+        Member.objects.create(group=self.group, name='Ann', phone_number='+260970000001')
+        self.client.force_login(User.objects.create_user('officer', password='x'))
+
+    def post(self, payload):
+        return self.client.post('/members/onboard/', json.dumps(payload), content_type='application/json')
+
+    def test_valid_rows_are_created_and_invalid_rows_reported(self):
+        rows = [
+            {'name': 'Bwalya', 'phone_number': '+260970000002'},
+            {'name': 'Chanda', 'phone_number': '+260970000001'},
+            {'name': '', 'phone_number': '+260970000003'},
+            {'name': 'Daliso', 'phone_number': '+260970000002'},
+            {'name': 'Esther', 'phone_number': '+260970000004', 'role': 'chair'},
+            {'name': 'Fumbani', 'phone_number': '+260970000005', 'role': 'treasurer'},
+        ]
+        created, errors = onboard_members(self.group, rows)
+        self.assertEqual([m.name for m in created], ['Bwalya', 'Fumbani'])
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertIn('already exists', errors[1]['phone_number'])
+        self.assertIn('name', errors[2])
+        self.assertIn('more than once', errors[3]['phone_number'])
+        self.assertIn('role', errors[4])
+        self.assertEqual(Member.objects.get(phone_number='+260970000005').role, 'treasurer')
+
+    def test_api_creates_group_and_members(self):
+        response = self.post({
+            'group': {'name': 'Tusekelele', 'cycle_start_date': '2026-02-01'},
+            'members': [{'name': 'Grace', 'phone_number': 260970000010}, {'name': 'Ruth', 'phone_number': ['x']}],
+        })
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        group = Group.objects.get(pk=body['group'])
+        self.assertEqual(group.name, 'Tusekelele')
+        self.assertEqual(list(group.members.values_list('phone_number', flat=True)), ['260970000010'])
+        self.assertEqual(body['errors'], [{'row': 1, 'errors': {'phone_number': 'Enter a text value.'}}])
+
+    def test_api_rejects_bad_payloads(self):
+        self.assertEqual(self.post({'group_id': 'abc', 'members': []}).status_code, 400)
+        self.assertEqual(self.post({'group_id': self.group.pk}).status_code, 400)
+        self.assertEqual(self.post({'group': 'abc', 'members': []}).status_code, 400)
+        self.assertEqual(self.post({'group': ['a'], 'members': []}).status_code, 400)
+        self.assertEqual(self.post({'members': [{'name': 'A', 'phone_number': '1'}]}).status_code, 400)
+        self.assertEqual(self.post({'group_id': 999999, 'members': []}).status_code, 404)
+        self.assertEqual(
+            self.client.post('/members/onboard/', 'not json', content_type='application/json').status_code, 400,
+        )
+
+    def test_command_reports_csv_lines(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('name,phone_number,role\nGrace,+260970000020,\n,+260970000021,\n')
+        self.addCleanup(os.unlink, f.name)
+        out, err = StringIO(), StringIO()
+        call_command('onboard_members', f.name, group=self.group.pk, stdout=out, stderr=err)
+        self.assertIn('Onboarded 1 members', out.getvalue())
+        self.assertIn('line 3: name', err.getvalue())
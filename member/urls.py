@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('groups/<int:group_id>/members/search/', views.member_search, name='member_search'),
+    path('members/onboard/', views.member_onboard, name='member_onboard'),
+]
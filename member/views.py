@@ -1,9 +1,16 @@
+import json
+
+from django.db import IntegrityError, transaction
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from django.urls import reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from .models import Member
+from .onboarding import onboard_members
+from .search import search_members
 from group.models import Group
 
 
@@ -46,6 +53,8 @@ def member_create(request):
                 return redirect('member_detail', pk=member.pk)
             except Group.DoesNotExist:
                 messages.error(request, 'Selected group does not exist.')
+            except IntegrityError:
+                messages.error(request, f'A member with phone number {phone_number} already exists.')
             except Exception as e:
                 messages.error(request, f'Error creating member: {str(e)}')
         else:
@@ -80,6 +89,8 @@ def member_update(request, pk):
                 return redirect('member_detail', pk=member.pk)
             except Group.DoesNotExist:
                 messages.error(request, 'Selected group does not exist.')
+            except IntegrityError:
+                messages.error(request, f'A member with phone number {phone_number} already exists.')
             except Exception as e:
                 messages.error(request, f'Error updating member: {str(e)}')
         else:
@@ -110,6 +121,52 @@ def member_delete(request, pk):
     }
     return render(request, 'member/member_confirm_delete.html', context)
 
+@login_required
+def member_search(request, group_id):
+    query = request.GET.get('q', '').strip()
+    return JsonResponse({'results': search_members(group_id, query)})
+
+@login_required
+@require_POST
+def member_onboard(request):
+    """Create a group's members from a JSON payload in one batch.
+
+    The payload names an existing group with ``group_id`` or a new one with
+    ``group`` (``name`` and ``cycle_start_date``), plus a ``members`` list of
+    ``name``/``phone_number``/``role`` objects. Valid rows are created and
+    invalid ones are reported by row index.
+    """
+    try:
+        payload = json.loads(request.body)
+        rows = payload['members']
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Expected a JSON object with a members list.'}, status=400)
+
+    with transaction.atomic():
+        if payload.get('group_id') is not None:
+            try:
+                group_id = int(str(payload['group_id']))
+            except ValueError:
+                return JsonResponse({'error': 'group_id must be an integer.'}, status=400)
+            group = get_object_or_404(Group, pk=group_id)
+        else:
+            details = payload.get('group') or {}
+            if not isinstance(details, dict) or not details.get('name') or not details.get('cycle_start_date'):
+                return JsonResponse({'error': 'Provide group_id or a group with name and cycle_start_date.'}, status=400)
+            try:
+                group = Group.objects.create(name=details['name'], cycle_start_date=details['cycle_start_date'])
+            except Exception as e:
+                return JsonResponse({'error': f'Error creating group: {str(e)}'}, status=400)
+        created, errors = onboard_members(group, rows)
+
+    return JsonResponse({
+        'group': group.pk,
+        'created': [{'id': member.pk, 'phone_number': member.phone_number} for member in created],
+        'errors': [{'row': index, 'errors': row_errors} for index, row_errors in sorted(errors.items())],
+    }, status=201 if created else 200)
+
 
 class MemberListView(ListView):
     model = Member